@@ -1,7 +1,11 @@
 
+import heapq
 import os
 import cv2
 import face_recognition
+import hashlib
+import numpy as np
+import shutil
 from PIL import Image, ExifTags
 import pandas as pd
 from datetime import datetime
@@ -14,31 +18,87 @@ INPUT_FOLDER = "path/to/your/photos"  # Replace with actual path
 REFERENCE_FOLDER = "path/to/reference/images"  # Replace with actual path
 OUTPUT_FOLDER = "path/to/output/folder"  # Replace with actual path
 TOP_PHOTOS_PER_EVENT = 5  # Number of top photos per event
+BATCH_SIZE = 128  # Images loaded per detection batch
+EXTS = ('.jpg', '.jpeg', '.png')
 
 # -----------------------------
 # HELPER FUNCTIONS
 # -----------------------------
+def _iter_images(folder):
+    """Yield DirEntry objects for images in folder via a single scandir pass."""
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(EXTS):
+                yield entry
+
 def load_reference_faces(reference_folder):
-    """Load reference images and compute face encodings."""
+    """Load reference face encodings as a (K, 128) float32 matrix.
+
+    Encodings are cached to disk keyed by the reference folder's file list
+    and mtimes, so the dlib ResNet only reruns when a reference changes.
+    """
+    entries = sorted(_iter_images(reference_folder), key=lambda e: e.name)
+    manifest = hashlib.sha1(repr(
+        [(e.name, e.stat().st_mtime) for e in entries]
+    ).encode()).hexdigest()
+    cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "photo_sort")
+    cache_path = os.path.join(cache_dir, f"refs_{manifest}.npy")
+
+    if os.path.exists(cache_path):
+        return np.load(cache_path)
+
     reference_encodings = []
-    for file in os.listdir(reference_folder):
-        if file.lower().endswith(('.jpg', '.jpeg', '.png')):
-            img_path = os.path.join(reference_folder, file)
-            image = face_recognition.load_image_file(img_path)
-            encodings = face_recognition.face_encodings(image)
-            if encodings:
-                reference_encodings.append(encodings[0])
-    return reference_encodings
-
-def detect_faces_and_match(image_path, reference_encodings):
-    """Detect faces and check if any match reference faces."""
-    image = face_recognition.load_image_file(image_path)
-    face_encodings = face_recognition.face_encodings(image)
-    for encoding in face_encodings:
-        matches = face_recognition.compare_faces(reference_encodings, encoding, tolerance=0.6)
-        if any(matches):
-            return True
-    return False
+    for entry in entries:
+        image = face_recognition.load_image_file(entry.path)
+        encodings = face_recognition.face_encodings(image)
+        if encodings:
+            reference_encodings.append(encodings[0])
+
+    ref_mat = np.ascontiguousarray(np.asarray(reference_encodings, dtype=np.float32))
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(cache_path, ref_mat)
+    return ref_mat
+
+def detect_faces_and_match_batch(image_paths, ref_mat):
+    """Detect faces in a batch of images and check which match reference faces.
+
+    Runs the CNN detector over whole batches so the GPU forward pass is
+    amortized, then encodes with the already-known face locations to
+    avoid a second detection pass. dlib's batch detector insists every
+    image in a batch share the same dimensions, and photo folders mix
+    resolutions and orientations freely, so images are grouped by shape
+    and detected one group at a time. Returns one bool per input path.
+    """
+    images = [face_recognition.load_image_file(p) for p in image_paths]
+    shape_groups = defaultdict(list)
+    for i, image in enumerate(images):
+        shape_groups[image.shape[:2]].append(i)
+    locations_by_index = [None] * len(images)
+    for indices in shape_groups.values():
+        batch_locations = face_recognition.batch_face_locations(
+            [images[i] for i in indices],
+            number_of_times_to_upsample=0, batch_size=32
+        )
+        for i, locations in zip(indices, batch_locations):
+            locations_by_index[i] = locations
+    results = []
+    for image, locations in zip(images, locations_by_index):
+        matched = False
+        encodings = face_recognition.face_encodings(image, known_face_locations=locations)
+        for encoding in encodings:
+            if _matches_reference(ref_mat, encoding):
+                matched = True
+                break
+        results.append(matched)
+    return results
+
+def _matches_reference(ref_mat, encoding, tolerance=0.6):
+    """Vectorized distance check of one encoding against all references."""
+    if ref_mat.size == 0:
+        return False
+    diff = ref_mat - encoding.astype(np.float32)
+    d2 = np.einsum('ij,ij->i', diff, diff)
+    return bool((d2 < tolerance * tolerance).any())
 
 def score_image_quality(image_path):
     """Score image quality based on sharpness, brightness, contrast, and resolution."""
@@ -77,10 +137,10 @@ def group_photos_by_event(photo_info):
     return events
 
 def select_top_photos(events, top_n):
+    # nlargest keeps a bounded heap instead of fully sorting each event
     selected_photos = []
     for date, photos in events.items():
-        sorted_photos = sorted(photos, key=lambda x: x['score'], reverse=True)
-        selected_photos.extend(sorted_photos[:top_n])
+        selected_photos.extend(heapq.nlargest(top_n, photos, key=lambda x: x['score']))
     return selected_photos
 
 def copy_selected_photos(selected_photos, output_folder):
@@ -90,7 +150,8 @@ def copy_selected_photos(selected_photos, output_folder):
         src = info['path']
         dst = os.path.join(output_folder, os.path.basename(src))
         try:
-            Image.open(src).save(dst)
+            # Straight byte copy - no decode/re-encode, preserves quality
+            shutil.copy2(src, dst)
         except Exception as e:
             print(f"Error copying {src}: {e}")
 
@@ -98,13 +159,14 @@ def copy_selected_photos(selected_photos, output_folder):
 # MAIN WORKFLOW
 # -----------------------------
 def main():
-    reference_encodings = load_reference_faces(REFERENCE_FOLDER)
-    photo_info = []
+    ref_mat = load_reference_faces(REFERENCE_FOLDER)
+    paths = [entry.path for entry in _iter_images(INPUT_FOLDER)]
 
-    for file in os.listdir(INPUT_FOLDER):
-        if file.lower().endswith(('.jpg', '.jpeg', '.png')):
-            path = os.path.join(INPUT_FOLDER, file)
-            has_face_match = detect_faces_and_match(path, reference_encodings)
+    photo_info = []
+    for start in range(0, len(paths), BATCH_SIZE):
+        batch = paths[start:start + BATCH_SIZE]
+        face_matches = detect_faces_and_match_batch(batch, ref_mat)
+        for path, has_face_match in zip(batch, face_matches):
             quality_score = score_image_quality(path)
             date = get_image_date(path)
             combined_score = quality_score + (1000 if has_face_match else 0)
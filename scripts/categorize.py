@@ -1,10 +1,20 @@
 
+import functools
 import os
 import shutil
 import re
-import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from datetime import datetime
 
+EXTS = ('.jpg', '.jpeg', '.png')
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path):
+    """Create a directory once; repeat calls are dict lookups, not stats."""
+    os.makedirs(path, exist_ok=True)
+    return path
+
 def extract_date_parts(filename):
     # Extract YYYY-MM-DD from filename
     match = re.search(r'(\d{4}-\d{2}-\d{2})', filename)
@@ -19,24 +29,17 @@ def extract_date_parts(filename):
     return "UnknownMonth", "UnknownDate"
 
 def categorize_photos_nested(input_folder, output_folder):
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
+    _ensure_dir(output_folder)
 
     photo_data = []
-    for file in os.listdir(input_folder):
-        if file.lower().endswith(('.jpg', '.jpeg', '.png')):
-            src = os.path.join(input_folder, file)
+    for entry in os.scandir(input_folder):
+        if entry.is_file() and entry.name.lower().endswith(EXTS):
+            file = entry.name
+            src = entry.path
             month_str, day_str = extract_date_parts(file)
 
-            # Create month folder
-            month_folder = os.path.join(output_folder, month_str)
-            if not os.path.exists(month_folder):
-                os.makedirs(month_folder)
-
-            # Create day folder inside month
-            day_folder = os.path.join(month_folder, day_str)
-            if not os.path.exists(day_folder):
-                os.makedirs(day_folder)
+            # Create day folder inside month folder (cached after first call)
+            day_folder = _ensure_dir(os.path.join(output_folder, month_str, day_str))
 
             dst = os.path.join(day_folder, file)
             try:
@@ -46,9 +49,8 @@ def categorize_photos_nested(input_folder, output_folder):
                 print(f"Error copying {file}: {e}")
 
     # Save CSV report
-    df = pd.DataFrame(photo_data)
     csv_path = os.path.join(output_folder, "photo_categorization_nested.csv")
-    df.to_csv(csv_path, index=False)
+    pacsv.write_csv(pa.Table.from_pylist(photo_data), csv_path)
     print(f"Categorization complete. Nested structure created. Report saved to {csv_path}")
 
 if __name__ == "__main__":
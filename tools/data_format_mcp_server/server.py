@@ -6,18 +6,38 @@ Provides tools for parsing and generating JSON and XML
 
 import asyncio
 import json
+import orjson
 import os
 import xml.etree.ElementTree as ET
 import xml.dom.minidom as minidom
+from collections import defaultdict
 from pathlib import Path
+
+try:
+    from lxml import etree as LET
+except ImportError:
+    LET = None  # fall back to stdlib ElementTree + minidom
+    _LXML_PARSER = None
+else:
+    # Unlike stdlib ElementTree, lxml keeps comment/PI nodes, whose .tag
+    # is a callable rather than a string and would poison xml_to_dict
+    _LXML_PARSER = LET.XMLParser(remove_comments=True, remove_pis=True)
+
+XML_PARSE_ERRORS = (ET.ParseError,) if LET is None else (ET.ParseError, LET.XMLSyntaxError)
 from typing import Optional
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 
 app = Server("data-format-server")
 
+_ENV_LOADED = False
+
 def load_env():
-    """Load environment variables from .env file"""
+    """Load environment variables from .env file (once per process)"""
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    _ENV_LOADED = True
     env_path = Path(__file__).parent.parent.parent / ".env"
     if env_path.exists():
         with open(env_path) as f:
@@ -30,6 +50,10 @@ def load_env():
 
 load_env()
 
+def dumps_indented(data) -> str:
+    """Serialize a tool result with 2-space indent via orjson"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     return [
@@ -135,17 +159,13 @@ def xml_to_dict(element):
             return element.text.strip()
         result['#text'] = element.text.strip()
     
-    # Add children
+    # Add children: append everything, then collapse singletons once
+    children = defaultdict(list)
     for child in element:
-        child_data = xml_to_dict(child)
-        if child.tag in result:
-            # Multiple children with same tag - make it a list
-            if not isinstance(result[child.tag], list):
-                result[child.tag] = [result[child.tag]]
-            result[child.tag].append(child_data)
-        else:
-            result[child.tag] = child_data
-    
+        children[child.tag].append(xml_to_dict(child))
+    result.update({tag: (values[0] if len(values) == 1 else values)
+                   for tag, values in children.items()})
+
     return result if result else None
 
 @app.call_tool()
@@ -153,75 +173,99 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     try:
         if name == "json_parse":
             json_string = arguments["json_string"]
-            parsed = json.loads(json_string)
+            parsed = orjson.loads(json_string)
             result = {
                 "success": True,
                 "data": parsed
             }
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=dumps_indented(result))]
         
         elif name == "json_generate":
             data = arguments["data"]
             indent = arguments.get("indent", 2)
-            json_string = json.dumps(data, indent=indent)
+            if indent == 2:
+                json_string = dumps_indented(data)
+            else:
+                # orjson only supports 2-space indent; keep stdlib for the rest
+                json_string = json.dumps(data, indent=indent)
             return [TextContent(type="text", text=json_string)]
         
         elif name == "json_validate":
             json_string = arguments["json_string"]
             try:
-                json.loads(json_string)
+                orjson.loads(json_string)
                 result = {
                     "valid": True,
                     "message": "JSON is valid"
                 }
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 result = {
                     "valid": False,
                     "message": str(e)
                 }
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=dumps_indented(result))]
         
         elif name == "xml_parse":
             xml_string = arguments["xml_string"]
-            root = ET.fromstring(xml_string)
+            if LET is not None:
+                # lxml takes bytes so the C parser handles encoding itself
+                root = LET.fromstring(
+                    xml_string.encode() if isinstance(xml_string, str) else xml_string,
+                    _LXML_PARSER
+                )
+            else:
+                root = ET.fromstring(xml_string)
             parsed = {
                 "root_tag": root.tag,
                 "data": xml_to_dict(root)
             }
-            return [TextContent(type="text", text=json.dumps(parsed, indent=2))]
+            return [TextContent(type="text", text=dumps_indented(parsed))]
         
         elif name == "xml_generate":
             root_tag = arguments["root_tag"]
             data = arguments["data"]
             pretty = arguments.get("pretty", True)
             
-            root = ET.Element(root_tag)
-            dict_to_xml(root, data)
-            
-            xml_string = ET.tostring(root, encoding='unicode')
-            
-            if pretty:
-                dom = minidom.parseString(xml_string)
-                xml_string = dom.toprettyxml(indent="  ")
-                # Remove empty lines
-                xml_string = '\n'.join([line for line in xml_string.split('\n') if line.strip()])
-            
+            if LET is not None:
+                # lxml pretty-prints straight from the element tree in C,
+                # with no re-parse through minidom
+                root = LET.Element(root_tag)
+                dict_to_xml(root, data)
+                xml_string = LET.tostring(root, pretty_print=pretty, encoding='unicode')
+                if pretty:
+                    xml_string = xml_string.rstrip('\n')
+            else:
+                root = ET.Element(root_tag)
+                dict_to_xml(root, data)
+                xml_string = ET.tostring(root, encoding='unicode')
+                if pretty:
+                    dom = minidom.parseString(xml_string)
+                    xml_string = dom.toprettyxml(indent="  ")
+                    # Remove empty lines
+                    xml_string = '\n'.join([line for line in xml_string.split('\n') if line.strip()])
+
             return [TextContent(type="text", text=xml_string)]
         
         elif name == "xml_validate":
             xml_string = arguments["xml_string"]
             try:
-                ET.fromstring(xml_string)
+                if LET is not None:
+                    LET.fromstring(
+                        xml_string.encode() if isinstance(xml_string, str) else xml_string,
+                        _LXML_PARSER
+                    )
+                else:
+                    ET.fromstring(xml_string)
                 result = {
                     "valid": True,
                     "message": "XML is well-formed"
                 }
-            except ET.ParseError as e:
+            except XML_PARSE_ERRORS as e:
                 result = {
                     "valid": False,
                     "message": str(e)
                 }
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=dumps_indented(result))]
         
         else:
             return [TextContent(type="text", text=f"Unknown tool: {name}")]
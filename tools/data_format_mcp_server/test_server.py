@@ -3,9 +3,19 @@
 Test script for the data format MCP server
 """
 import subprocess
+import threading
 import json
 import os
 
+# Enlarge the kernel pipe where supported so big JSON-RPC replies do not
+# stall the child at the default pipe size
+_PIPE_KWARGS = {"pipesize": 1 << 20} if hasattr(os, "F_SETPIPE_SZ") else {}
+
+def _drain(pipe):
+    """Consume a child pipe so verbose logging cannot fill it and stall the server."""
+    for _ in iter(pipe.readline, ""):
+        pass
+
 def test_mcp_server():
     """Test the MCP server by sending JSON-RPC messages"""
     
@@ -15,8 +25,11 @@ def test_mcp_server():
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
+        bufsize=-1,  # block-buffered pipes: one syscall per message, not per line
+        **_PIPE_KWARGS,
         cwd=os.path.dirname(__file__)
     )
+    threading.Thread(target=_drain, args=(proc.stderr,), daemon=True).start()
     
     # Initialize the connection
     init_request = {
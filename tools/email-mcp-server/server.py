@@ -3,18 +3,25 @@
 MCP Server for sending emails via SMTP
 Includes support for creating Todoist tasks via email
 """
-import smtplib
+import aiosmtplib
+import asyncio
+import atexit
 import os
 from pathlib import Path
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 import mcp.server.stdio
 
 # Load environment variables from .env file
+_ENV_LOADED = False
+
 def load_env():
-    """Load environment variables from .env file in project root"""
+    """Load environment variables from .env file in project root (once per process)"""
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    _ENV_LOADED = True
     env_path = Path(__file__).parent.parent.parent / ".env"
     if env_path.exists():
         with open(env_path) as f:
@@ -29,6 +36,54 @@ load_env()
 
 server = Server("email-server")
 
+# Shared SMTP connection so back-to-back sends reuse one TCP+TLS+AUTH
+# handshake instead of paying it per email; aiosmtplib keeps the send
+# off the event loop so concurrent tool calls overlap network latency
+_smtp: aiosmtplib.SMTP | None = None
+_smtp_lock = asyncio.Lock()
+
+async def _get_smtp(host: str, port: int, user: str, password: str) -> aiosmtplib.SMTP:
+    """Return the shared authenticated connection, opening it if needed.
+
+    An existing connection is liveness-probed with NOOP; servers drop
+    idle connections, so a dead one is silently replaced.
+    """
+    global _smtp
+    if _smtp is not None:
+        try:
+            await _smtp.noop()
+            return _smtp
+        except (aiosmtplib.errors.SMTPException, OSError):
+            _smtp = None
+    conn = aiosmtplib.SMTP(hostname=host, port=port, start_tls=True)
+    await conn.connect()
+    await conn.login(user, password)
+    _smtp = conn
+    return conn
+
+def _close_smtp():
+    global _smtp
+    if _smtp is not None:
+        try:
+            _smtp.close()
+        except Exception:
+            pass
+        _smtp = None
+
+atexit.register(_close_smtp)
+
+async def _send_message(msg, host: str, port: int, user: str, password: str):
+    """Send msg over the shared connection, reconnecting once on disconnect."""
+    global _smtp
+    async with _smtp_lock:
+        try:
+            conn = await _get_smtp(host, port, user, password)
+            await conn.send_message(msg)
+        except aiosmtplib.errors.SMTPServerDisconnected:
+            _smtp = None
+            conn = await _get_smtp(host, port, user, password)
+            await conn.send_message(msg)
+
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """List available email tools"""
@@ -122,23 +177,16 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         body = arguments["body"]
         is_html = arguments.get("html", False)
         
-        # Create message
-        msg = MIMEMultipart('alternative')
+        # Create message; a single body needs no multipart wrapper
+        msg = MIMEText(body, 'html' if is_html else 'plain')
         msg['Subject'] = subject
         msg['From'] = smtp_user
         msg['To'] = to_addr
-        
-        # Attach body
-        mime_type = 'html' if is_html else 'plain'
-        msg.attach(MIMEText(body, mime_type))
-        
+
         # Send email
         try:
-            with smtplib.SMTP(smtp_host, smtp_port) as smtp_server:
-                smtp_server.starttls()
-                smtp_server.login(smtp_user, smtp_password)
-                smtp_server.send_message(msg)
-            
+            await _send_message(msg, smtp_host, smtp_port, smtp_user, smtp_password)
+
             return [TextContent(
                 type="text",
                 text=f"Email sent successfully to {to_addr}"
@@ -188,23 +236,16 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         
         subject = " ".join(subject_parts)
         
-        # Create message
-        msg = MIMEMultipart('alternative')
+        # Create message; Todoist only reads the subject, body is optional
+        msg = MIMEText(description, 'plain')
         msg['Subject'] = subject
         msg['From'] = smtp_user
         msg['To'] = todoist_email
-        
-        # Attach body if provided
-        if description:
-            msg.attach(MIMEText(description, 'plain'))
-        
+
         # Send email to Todoist
         try:
-            with smtplib.SMTP(smtp_host, smtp_port) as smtp_server:
-                smtp_server.starttls()
-                smtp_server.login(smtp_user, smtp_password)
-                smtp_server.send_message(msg)
-            
+            await _send_message(msg, smtp_host, smtp_port, smtp_user, smtp_password)
+
             return [TextContent(
                 type="text",
                 text=f"Task created in Todoist: '{title}'"
@@ -228,5 +269,4 @@ async def main():
         )
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
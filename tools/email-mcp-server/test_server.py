@@ -3,23 +3,33 @@
 Simple test script for the email MCP server
 """
 import subprocess
+import threading
 import json
 import os
+import re
 from pathlib import Path
 
+# Matches KEY=value lines, skipping comments, in one C-level pass
+_ENV_RE = re.compile(r'(?m)^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=(.*)$')
+
+# Enlarge the kernel pipe where supported so big JSON-RPC replies do not
+# stall the child at the default pipe size
+_PIPE_KWARGS = {"pipesize": 1 << 20} if hasattr(os, "F_SETPIPE_SZ") else {}
+
 def load_env():
     """Load environment variables from .env file in project root"""
     env_path = Path(__file__).parent.parent.parent / ".env"
     env_vars = {}
     if env_path.exists():
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    key, value = line.split('=', 1)
-                    env_vars[key.strip()] = value.strip()
+        for key, value in _ENV_RE.findall(env_path.read_text()):
+            env_vars[key] = value.strip()
     return env_vars
 
+def _drain(pipe):
+    """Consume a child pipe so verbose logging cannot fill it and stall the server."""
+    for _ in iter(pipe.readline, ""):
+        pass
+
 def test_mcp_server():
     """Test the MCP server by sending JSON-RPC messages"""
     
@@ -42,9 +52,12 @@ def test_mcp_server():
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
+        bufsize=-1,  # block-buffered pipes: one syscall per message, not per line
+        **_PIPE_KWARGS,
         env=env,
         cwd=os.path.dirname(__file__)
     )
+    threading.Thread(target=_drain, args=(proc.stderr,), daemon=True).start()
     
     # Initialize the connection
     init_request = {
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import os
 import subprocess
 from pathlib import Path
@@ -6,240 +7,397 @@ from typing import Optional
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 
+# Optional: in-process libgit2 bindings; read-only tools skip the git fork
+# entirely when available and fall back to the CLI when not
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
 app = Server("git-server")
 
-def run_git_command(repo_path: str, command: list[str], timeout: int = 60) -> tuple[bool, str]:
-    """Run a git command and return success status and output"""
+# Enlarge the kernel pipe where supported so long git log/diff output does
+# not stall the child at the default pipe size
+_PIPE_KWARGS = {"pipesize": 1 << 20} if hasattr(os, "F_SETPIPE_SZ") else {}
+
+def _run_git_sync(repo_path: str, command: list[str], timeout: int) -> tuple[bool, str]:
+    """Blocking git invocation; runs in a worker thread via run_git_command"""
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             ["git"] + command,
             cwd=repo_path,
-            capture_output=True,
-            text=True,
-            timeout=timeout
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=-1,
+            **_PIPE_KWARGS
         )
-        output = result.stdout + result.stderr
-        return result.returncode == 0, output
-    except subprocess.TimeoutExpired:
-        return False, f"Command timed out after {timeout} seconds"
+        try:
+            out, err = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            return False, f"Command timed out after {timeout} seconds"
+        # Decode once at the end instead of per-pipe text wrapping
+        output = (out + err).decode(errors="replace")
+        return proc.returncode == 0, output
     except Exception as e:
         return False, str(e)
 
+@functools.lru_cache(maxsize=64)
+def _is_repo(path: str) -> bool:
+    """Check a path is a git repository, cached so repeat calls skip the stat() syscalls.
+
+    Tests (and anything that deletes a repo mid-session) can reset the
+    cache via _is_repo.cache_clear().
+    """
+    repo = Path(path)
+    return repo.is_dir() and (repo / ".git").exists()
+
+async def run_git_command(repo_path: str, command: list[str], timeout: int = 60) -> tuple[bool, str]:
+    """Run a git command off the event loop and return success status and output.
+
+    Offloading to a thread keeps the server responsive, so concurrent tool
+    calls overlap their git I/O instead of serializing behind one subprocess.
+    """
+    return await asyncio.to_thread(_run_git_sync, repo_path, command, timeout)
+
+# Tool schemas are static; build them once at import instead of per tools/list request
+_TOOLS = [
+    Tool(
+        name="git_status",
+        description="Show the working tree status",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_path": {"type": "string", "description": "Path to git repository"}
+            },
+            "required": ["repo_path"]
+        }
+    ),
+    Tool(
+        name="git_add",
+        description="Add file contents to the staging area",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_path": {"type": "string", "description": "Path to git repository"},
+                "files": {"type": "string", "description": "Files to add (e.g., '.', '*.py', 'file.txt')"}
+            },
+            "required": ["repo_path", "files"]
+        }
+    ),
+    Tool(
+        name="git_commit",
+        description="Record changes to the repository",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_path": {"type": "string", "description": "Path to git repository"},
+                "message": {"type": "string", "description": "Commit message"}
+            },
+            "required": ["repo_path", "message"]
+        }
+    ),
+    Tool(
+        name="git_push",
+        description="Update remote refs along with associated objects",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_path": {"type": "string", "description": "Path to git repository"},
+                "remote": {"type": "string", "description": "Remote name (default: origin)", "default": "origin"},
+                "branch": {"type": "string", "description": "Branch name (if empty, pushes current branch)"}
+            },
+            "required": ["repo_path"]
+        }
+    ),
+    Tool(
+        name="git_pull",
+        description="Fetch from and integrate with another repository or local branch",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_path": {"type": "string", "description": "Path to git repository"},
+                "remote": {"type": "string", "description": "Remote name (default: origin)", "default": "origin"},
+                "branch": {"type": "string", "description": "Branch name (if empty, pulls current branch)"}
+            },
+            "required": ["repo_path"]
+        }
+    ),
+    Tool(
+        name="git_branch",
+        description="List, create, or delete branches",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_path": {"type": "string", "description": "Path to git repository"},
+                "action": {"type": "string", "description": "Action: list, create, delete", "enum": ["list", "create", "delete"]},
+                "branch_name": {"type": "string", "description": "Branch name (for create/delete)"}
+            },
+            "required": ["repo_path", "action"]
+        }
+    ),
+    Tool(
+        name="git_checkout",
+        description="Switch branches or restore working tree files",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_path": {"type": "string", "description": "Path to git repository"},
+                "branch": {"type": "string", "description": "Branch name to checkout"}
+            },
+            "required": ["repo_path", "branch"]
+        }
+    ),
+    Tool(
+        name="git_log",
+        description="Show commit logs",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_path": {"type": "string", "description": "Path to git repository"},
+                "max_count": {"type": "integer", "description": "Limit the number of commits", "default": 10}
+            },
+            "required": ["repo_path"]
+        }
+    ),
+    Tool(
+        name="git_diff",
+        description="Show changes between commits, commit and working tree, etc",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_path": {"type": "string", "description": "Path to git repository"},
+                "cached": {"type": "boolean", "description": "Show staged changes", "default": False}
+            },
+            "required": ["repo_path"]
+        }
+    )
+]
+
 @app.list_tools()
 async def list_tools() -> list[Tool]:
-    return [
-        Tool(
-            name="git_status",
-            description="Show the working tree status",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_path": {"type": "string", "description": "Path to git repository"}
-                },
-                "required": ["repo_path"]
-            }
-        ),
-        Tool(
-            name="git_add",
-            description="Add file contents to the staging area",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_path": {"type": "string", "description": "Path to git repository"},
-                    "files": {"type": "string", "description": "Files to add (e.g., '.', '*.py', 'file.txt')"}
-                },
-                "required": ["repo_path", "files"]
-            }
-        ),
-        Tool(
-            name="git_commit",
-            description="Record changes to the repository",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_path": {"type": "string", "description": "Path to git repository"},
-                    "message": {"type": "string", "description": "Commit message"}
-                },
-                "required": ["repo_path", "message"]
-            }
-        ),
-        Tool(
-            name="git_push",
-            description="Update remote refs along with associated objects",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_path": {"type": "string", "description": "Path to git repository"},
-                    "remote": {"type": "string", "description": "Remote name (default: origin)", "default": "origin"},
-                    "branch": {"type": "string", "description": "Branch name (if empty, pushes current branch)"}
-                },
-                "required": ["repo_path"]
-            }
-        ),
-        Tool(
-            name="git_pull",
-            description="Fetch from and integrate with another repository or local branch",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_path": {"type": "string", "description": "Path to git repository"},
-                    "remote": {"type": "string", "description": "Remote name (default: origin)", "default": "origin"},
-                    "branch": {"type": "string", "description": "Branch name (if empty, pulls current branch)"}
-                },
-                "required": ["repo_path"]
-            }
-        ),
-        Tool(
-            name="git_branch",
-            description="List, create, or delete branches",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_path": {"type": "string", "description": "Path to git repository"},
-                    "action": {"type": "string", "description": "Action: list, create, delete", "enum": ["list", "create", "delete"]},
-                    "branch_name": {"type": "string", "description": "Branch name (for create/delete)"}
-                },
-                "required": ["repo_path", "action"]
-            }
-        ),
-        Tool(
-            name="git_checkout",
-            description="Switch branches or restore working tree files",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_path": {"type": "string", "description": "Path to git repository"},
-                    "branch": {"type": "string", "description": "Branch name to checkout"}
-                },
-                "required": ["repo_path", "branch"]
-            }
-        ),
-        Tool(
-            name="git_log",
-            description="Show commit logs",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_path": {"type": "string", "description": "Path to git repository"},
-                    "max_count": {"type": "integer", "description": "Limit the number of commits", "default": 10}
-                },
-                "required": ["repo_path"]
-            }
-        ),
-        Tool(
-            name="git_diff",
-            description="Show changes between commits, commit and working tree, etc",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_path": {"type": "string", "description": "Path to git repository"},
-                    "cached": {"type": "boolean", "description": "Show staged changes", "default": False}
-                },
-                "required": ["repo_path"]
-            }
-        )
-    ]
+    return _TOOLS
+
+def _text(msg: str) -> list[TextContent]:
+    """Wrap a message as the single-item content list every tool returns"""
+    return [TextContent(type="text", text=msg)]
+
+# Pre-built responses for the static error strings skip pydantic
+# validation on those paths entirely
+_ERR_BRANCH_NAME_CREATE = _text("Error: branch_name required for create")
+_ERR_BRANCH_NAME_DELETE = _text("Error: branch_name required for delete")
+
+# Hot read-only commands skip the optional index refresh lock: no .git/index
+# write, no lock contention with a concurrent IDE or fetch
+_RO = "--no-optional-locks"
+
+# Repository handles are cheap to keep and expensive to open; cache per path
+_repo_cache: dict = {}
+
+def _pygit2_repo(repo_path: str):
+    repo = _repo_cache.get(repo_path)
+    if repo is None:
+        repo = pygit2.Repository(repo_path)
+        _repo_cache[repo_path] = repo
+    return repo
+
+_STATUS_LABELS = None
+
+def _status_pygit2(repo_path: str) -> str:
+    global _STATUS_LABELS
+    if _STATUS_LABELS is None:
+        _STATUS_LABELS = [
+            (pygit2.GIT_STATUS_INDEX_NEW, "new file (staged)"),
+            (pygit2.GIT_STATUS_INDEX_MODIFIED, "modified (staged)"),
+            (pygit2.GIT_STATUS_INDEX_DELETED, "deleted (staged)"),
+            (pygit2.GIT_STATUS_WT_NEW, "untracked"),
+            (pygit2.GIT_STATUS_WT_MODIFIED, "modified"),
+            (pygit2.GIT_STATUS_WT_DELETED, "deleted"),
+        ]
+    repo = _pygit2_repo(repo_path)
+    branch = "HEAD (detached)" if repo.head_is_detached else repo.head.shorthand
+    lines = [f"On branch {branch}"]
+    status = repo.status()
+    if not status:
+        lines.append("nothing to commit, working tree clean")
+    else:
+        for path in sorted(status):
+            flags = status[path]
+            for flag, label in _STATUS_LABELS:
+                if flags & flag:
+                    lines.append(f"  {label}: {path}")
+    return "\n".join(lines) + "\n"
+
+def _log_pygit2(repo_path: str, max_count: int) -> str:
+    repo = _pygit2_repo(repo_path)
+    lines = []
+    for commit in repo.walk(repo.head.target, pygit2.GIT_SORT_NONE):
+        summary = commit.message.split("\n", 1)[0]
+        lines.append(f"{str(commit.id)[:7]} {summary}")
+        if len(lines) >= max_count:
+            break
+    return "\n".join(lines) + "\n"
+
+def _branches_pygit2(repo_path: str) -> str:
+    repo = _pygit2_repo(repo_path)
+    current = None if repo.head_is_detached else repo.head.shorthand
+    lines = []
+    for name in repo.branches.local:
+        marker = "*" if name == current else " "
+        lines.append(f"{marker} {name}")
+    for name in repo.branches.remote:
+        lines.append(f"  remotes/{name}")
+    return "\n".join(lines) + "\n"
+
+def _diff_pygit2(repo_path: str, cached: bool) -> str:
+    repo = _pygit2_repo(repo_path)
+    return repo.diff("HEAD", cached=True).patch if cached else repo.diff().patch
+
+async def _handle_git_status(repo_path: str, arguments: dict) -> list[TextContent]:
+    if pygit2 is not None:
+        try:
+            output = await asyncio.to_thread(_status_pygit2, repo_path)
+            return _text(output)
+        except Exception:
+            pass  # unborn HEAD, bare repo, etc.: let the git CLI report it
+    success, output = await run_git_command(repo_path, [_RO, "status"])
+    return _text(output if success else f"Error: {output}")
+
+async def _handle_git_add(repo_path: str, arguments: dict) -> list[TextContent]:
+    files = arguments["files"]
+    # Use longer timeout for add operations; --verbose already lists what
+    # was staged, so no follow-up status subprocess is needed
+    success, output = await run_git_command(repo_path, ["add", "--verbose", files], timeout=120)
+    if success:
+        return _text(f"Added files matching '{files}'\n\n{output}")
+    return _text(f"Error: {output}")
+
+async def _handle_git_commit(repo_path: str, arguments: dict) -> list[TextContent]:
+    message = arguments["message"]
+    success, output = await run_git_command(repo_path, ["commit", "-m", message])
+    return _text(output if success else f"Error: {output}")
+
+async def _handle_git_push(repo_path: str, arguments: dict) -> list[TextContent]:
+    remote = arguments.get("remote", "origin")
+    branch = arguments.get("branch", "")
+
+    if branch:
+        cmd = ["push", remote, branch]
+    else:
+        cmd = ["push", remote]
+
+    success, output = await run_git_command(repo_path, cmd)
+    return _text(output if success else f"Error: {output}")
+
+async def _handle_git_pull(repo_path: str, arguments: dict) -> list[TextContent]:
+    remote = arguments.get("remote", "origin")
+    branch = arguments.get("branch", "")
+
+    if branch:
+        cmd = ["pull", remote, branch]
+    else:
+        cmd = ["pull", remote]
+
+    success, output = await run_git_command(repo_path, cmd)
+    return _text(output if success else f"Error: {output}")
+
+async def _handle_git_branch(repo_path: str, arguments: dict) -> list[TextContent]:
+    action = arguments["action"]
+
+    if action == "list":
+        if pygit2 is not None:
+            try:
+                output = await asyncio.to_thread(_branches_pygit2, repo_path)
+                return _text(output)
+            except Exception:
+                pass
+        success, output = await run_git_command(repo_path, [_RO, "branch", "-a"])
+    elif action == "create":
+        branch_name = arguments.get("branch_name")
+        if not branch_name:
+            return _ERR_BRANCH_NAME_CREATE
+        success, output = await run_git_command(repo_path, ["branch", branch_name])
+    elif action == "delete":
+        branch_name = arguments.get("branch_name")
+        if not branch_name:
+            return _ERR_BRANCH_NAME_DELETE
+        success, output = await run_git_command(repo_path, ["branch", "-d", branch_name])
+    else:
+        return _text(f"Error: unknown action {action}")
+
+    return _text(output if success else f"Error: {output}")
+
+async def _handle_git_checkout(repo_path: str, arguments: dict) -> list[TextContent]:
+    branch = arguments["branch"]
+    success, output = await run_git_command(repo_path, ["checkout", branch])
+    return _text(output if success else f"Error: {output}")
+
+# Formatting git_log's arguments is pure string churn; keep the static
+# flags as a constant and memoize the --max-count flag per value
+_LOG_FLAGS = ("--oneline", "--decorate")
+_MAXCOUNT_CACHE: dict = {}
+
+async def _handle_git_log(repo_path: str, arguments: dict) -> list[TextContent]:
+    max_count = arguments.get("max_count", 10)
+    if pygit2 is not None:
+        try:
+            output = await asyncio.to_thread(_log_pygit2, repo_path, max_count)
+            return _text(output)
+        except Exception:
+            pass
+    flag = _MAXCOUNT_CACHE.setdefault(max_count, f"--max-count={max_count}")
+    success, output = await run_git_command(repo_path, [_RO, "log", flag, *_LOG_FLAGS])
+    return _text(output if success else f"Error: {output}")
+
+async def _handle_git_diff(repo_path: str, arguments: dict) -> list[TextContent]:
+    cached = arguments.get("cached", False)
+    if pygit2 is not None:
+        try:
+            output = await asyncio.to_thread(_diff_pygit2, repo_path, cached)
+            if not output:
+                output = "No changes" if not cached else "No staged changes"
+            return _text(output)
+        except Exception:
+            pass
+    cmd = [_RO, "diff", "--cached"] if cached else [_RO, "diff"]
+    success, output = await run_git_command(repo_path, cmd)
+
+    if not output:
+        output = "No changes" if not cached else "No staged changes"
+
+    return _text(output)
+
+# Constant-time dispatch instead of an if/elif chain over tool names
+_HANDLERS = {
+    "git_status": _handle_git_status,
+    "git_add": _handle_git_add,
+    "git_commit": _handle_git_commit,
+    "git_push": _handle_git_push,
+    "git_pull": _handle_git_pull,
+    "git_branch": _handle_git_branch,
+    "git_checkout": _handle_git_checkout,
+    "git_log": _handle_git_log,
+    "git_diff": _handle_git_diff,
+}
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     try:
+        handler = _HANDLERS.get(name)
+        if handler is None:
+            return _text(f"Unknown tool: {name}")
+
         repo_path = arguments["repo_path"]
-        
+
         # Verify it's a git repository
-        if not Path(repo_path).is_dir():
-            return [TextContent(type="text", text=f"Error: {repo_path} is not a directory")]
-        
-        if name == "git_status":
-            success, output = run_git_command(repo_path, ["status"])
-            return [TextContent(type="text", text=output if success else f"Error: {output}")]
-        
-        elif name == "git_add":
-            files = arguments["files"]
-            # Use longer timeout for add operations
-            success, output = run_git_command(repo_path, ["add", files], timeout=120)
-            if success:
-                # Show what was added
-                success2, status = run_git_command(repo_path, ["status", "--short"])
-                return [TextContent(type="text", text=f"Added files matching '{files}'\n\n{status}")]
-            return [TextContent(type="text", text=f"Error: {output}")]
-        
-        elif name == "git_commit":
-            message = arguments["message"]
-            success, output = run_git_command(repo_path, ["commit", "-m", message])
-            return [TextContent(type="text", text=output if success else f"Error: {output}")]
-        
-        elif name == "git_push":
-            remote = arguments.get("remote", "origin")
-            branch = arguments.get("branch", "")
-            
-            if branch:
-                cmd = ["push", remote, branch]
-            else:
-                cmd = ["push", remote]
-            
-            success, output = run_git_command(repo_path, cmd)
-            return [TextContent(type="text", text=output if success else f"Error: {output}")]
-        
-        elif name == "git_pull":
-            remote = arguments.get("remote", "origin")
-            branch = arguments.get("branch", "")
-            
-            if branch:
-                cmd = ["pull", remote, branch]
-            else:
-                cmd = ["pull", remote]
-            
-            success, output = run_git_command(repo_path, cmd)
-            return [TextContent(type="text", text=output if success else f"Error: {output}")]
-        
-        elif name == "git_branch":
-            action = arguments["action"]
-            
-            if action == "list":
-                success, output = run_git_command(repo_path, ["branch", "-a"])
-            elif action == "create":
-                branch_name = arguments.get("branch_name")
-                if not branch_name:
-                    return [TextContent(type="text", text="Error: branch_name required for create")]
-                success, output = run_git_command(repo_path, ["branch", branch_name])
-            elif action == "delete":
-                branch_name = arguments.get("branch_name")
-                if not branch_name:
-                    return [TextContent(type="text", text="Error: branch_name required for delete")]
-                success, output = run_git_command(repo_path, ["branch", "-d", branch_name])
-            else:
-                return [TextContent(type="text", text=f"Error: unknown action {action}")]
-            
-            return [TextContent(type="text", text=output if success else f"Error: {output}")]
-        
-        elif name == "git_checkout":
-            branch = arguments["branch"]
-            success, output = run_git_command(repo_path, ["checkout", branch])
-            return [TextContent(type="text", text=output if success else f"Error: {output}")]
-        
-        elif name == "git_log":
-            max_count = arguments.get("max_count", 10)
-            success, output = run_git_command(
-                repo_path, 
-                ["log", f"--max-count={max_count}", "--oneline", "--decorate"]
-            )
-            return [TextContent(type="text", text=output if success else f"Error: {output}")]
-        
-        elif name == "git_diff":
-            cached = arguments.get("cached", False)
-            cmd = ["diff", "--cached"] if cached else ["diff"]
-            success, output = run_git_command(repo_path, cmd)
-            
-            if not output:
-                output = "No changes" if not cached else "No staged changes"
-            
-            return [TextContent(type="text", text=output)]
-        
-        else:
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
-    
+        if not _is_repo(repo_path):
+            return _text(f"Error: {repo_path} is not a git repository")
+
+        return await handler(repo_path, arguments)
+
     except Exception as e:
-        return [TextContent(type="text", text=f"Error: {str(e)}")]
+        return _text(f"Error: {str(e)}")
 
 async def main():
     from mcp.server.stdio import stdio_server
@@ -1,9 +1,11 @@
 
+import asyncio
 import unittest
 from pathlib import Path
 from server import call_tool, list_tools
 import tempfile
 import os
+import subprocess
 
 REPO_PATH = r"C:\Users\steph\workspace\GitHub\ai"
 
@@ -32,46 +34,63 @@ class TestGitReadOnlyIntegration(unittest.IsolatedAsyncioTestCase):
         print("\n[git_branch list output]\n", result[0].text)
         self.assertTrue("main" in result[0].text or len(result[0].text.strip()) > 0)
 
+    async def test_parallel_readonly(self):
+        """Read-only tools run concurrently; wall time is max(git_cmd), not sum"""
+        status, log, diff, branches = await asyncio.gather(
+            call_tool("git_status", {"repo_path": REPO_PATH}),
+            call_tool("git_log", {"repo_path": REPO_PATH, "max_count": 5}),
+            call_tool("git_diff", {"repo_path": REPO_PATH, "cached": False}),
+            call_tool("git_branch", {"repo_path": REPO_PATH, "action": "list"}),
+        )
+        self.assertIn("On branch", status[0].text)
+        self.assertTrue(len(log[0].text.strip()) > 0)
+        self.assertIsInstance(diff[0].text, str)
+        self.assertTrue(len(branches[0].text.strip()) > 0)
+
 
 async def test_real_git_lifecycle(self):
     """Lifecycle test on the real repo: create -> add -> commit -> delete -> commit deletion"""
-    file_path = Path(REPO_PATH) / "lifecycle_real.txt"
-
-    # Step 1: Create file
-    file_path.write_text("Hello Git Lifecycle in real repo")
+    # Step 1: Create file; a unique temp name keeps parallel runs from
+    # racing on the same path
+    with tempfile.NamedTemporaryFile(
+        "w", dir=REPO_PATH, prefix="lifecycle_real_", suffix=".txt", delete=False
+    ) as tf:
+        tf.write("Hello Git Lifecycle in real repo")
+        file_path = Path(tf.name)
+    file_name = file_path.name
     self.assertTrue(file_path.exists())
 
     # Step 2: Add file
-    add_result = await call_tool("git_add", {"repo_path": REPO_PATH, "files": "lifecycle_real.txt"})
+    add_result = await call_tool("git_add", {"repo_path": REPO_PATH, "files": file_name})
     print("\n[git_add output]\n", add_result[0].text)
     self.assertIn("Added files", add_result[0].text)
 
     # Step 3: Commit file (force commit only staged changes)
-    commit_result = await call_tool("git_commit", {"repo_path": REPO_PATH, "message": "Add lifecycle_real.txt"})
+    commit_result = await call_tool("git_commit", {"repo_path": REPO_PATH, "message": f"Add {file_name}"})
     print("\n[git_commit output]\n", commit_result[0].text)
 
     # If commit failed due to unstaged changes, retry with `-a`
     if "no changes added" in commit_result[0].text.lower():
         print("[Retrying commit with -a]")
-        os.system(f'git -C "{REPO_PATH}" commit -am "Add lifecycle_real.txt"')
+        subprocess.run(["git", "-C", REPO_PATH, "commit", "-am", f"Add {file_name}"], check=False)
 
     # Step 4: Delete file
     file_path.unlink()
     self.assertFalse(file_path.exists())
 
     # Step 5: Commit deletion
-    commit_delete_result = await call_tool("git_commit", {"repo_path": REPO_PATH, "message": "Remove lifecycle_real.txt"})
+    commit_delete_result = await call_tool("git_commit", {"repo_path": REPO_PATH, "message": f"Remove {file_name}"})
     print("\n[git_commit deletion output]\n", commit_delete_result[0].text)
 
     if "no changes added" in commit_delete_result[0].text.lower():
         print("[Retrying deletion commit with -a]")
-        os.system(f'git -C "{REPO_PATH}" commit -am "Remove lifecycle_real.txt"')
+        subprocess.run(["git", "-C", REPO_PATH, "commit", "-am", f"Remove {file_name}"], check=False)
 
     # Step 6: Verify log
     log_result = await call_tool("git_log", {"repo_path": REPO_PATH, "max_count": 10})
     print("\n[git_log after lifecycle]\n", log_result[0].text)
-    self.assertIn("Add lifecycle_real.txt", log_result[0].text)
-    self.assertIn("Remove lifecycle_real.txt", log_result[0].text)
+    self.assertIn(f"Add {file_name}", log_result[0].text)
+    self.assertIn(f"Remove {file_name}", log_result[0].text)
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
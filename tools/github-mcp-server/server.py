@@ -1,13 +1,30 @@
 import asyncio
+import functools
 import os
 import json
-from typing import Optional
+import re
+from typing import Any, Optional
 from mcp.server import Server
 from mcp.types import Tool, TextContent
-import requests
-from urllib.parse import urlparse
+import aiohttp
 from pathlib import Path
 from dotenv import load_dotenv
+from cachetools import TTLCache
+
+# Optional: C JSON codec, 2-5x faster than stdlib on these payloads
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps_indented(data) -> str:
+    """Serialize a tool result with 2-space indent via orjson"""
+    if orjson is None:
+        return json.dumps(data, indent=2)
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+def _loads(body: bytes) -> Any:
+    return json.loads(body) if orjson is None else orjson.loads(body)
 
 # Load .env file - try multiple locations
 script_dir = Path(__file__).parent
@@ -36,160 +53,322 @@ def get_headers():
         "Accept": "application/vnd.github.v3+json"
     }
 
+# One keep-alive session serves every tool call, so only the first request
+# pays the TCP+TLS handshake; it is created lazily so it binds to the
+# running event loop, and closed in main()
+_session: Optional[aiohttp.ClientSession] = None
+
+async def _get_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, limit_per_host=10, keepalive_timeout=75),
+            headers=get_headers()
+        )
+    return _session
+
+async def _close_session():
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+# Bound concurrent API requests so parallel fetches stay clear of
+# GitHub's secondary abuse limits
+_sem = asyncio.Semaphore(10)
+
+# (url, params) -> (etag, parsed body); GitHub answers a matching ETag
+# with an empty 304 that is not charged against the rate limit
+_etag_cache: dict = {}
+
+# Agent loops often repeat the same read within seconds; a short TTL
+# cache answers those with zero round-trips on top of the ETag layer
+# (which still costs one RTT per revalidation). One cache per TTL class,
+# since TTLCache fixes the lifetime at construction.
+_body_caches: dict[int, TTLCache] = {}
+
+def _body_cache(ttl: int) -> TTLCache:
+    cache = _body_caches.get(ttl)
+    if cache is None:
+        cache = _body_caches[ttl] = TTLCache(maxsize=512, ttl=ttl)
+    return cache
+
+def _invalidate(url_prefix: str):
+    """Drop cached bodies under a URL prefix after a write to that repo"""
+    for cache in _body_caches.values():
+        for key in [k for k in cache if k[0].startswith(url_prefix)]:
+            del cache[key]
+
+async def _get_json(url: str, params: Optional[dict] = None, ttl: int = 30) -> Any:
+    """GET a GitHub API endpoint and return the parsed JSON body.
+
+    A body younger than ttl seconds is served straight from memory.
+    Past that, If-None-Match is sent when the resource was fetched
+    before; a 304 replays the cached body at zero bandwidth and zero
+    rate-limit cost.
+    """
+    key = (url, frozenset(params.items()) if params else None)
+    fresh = _body_cache(ttl)
+    if key in fresh:
+        return fresh[key]
+    cached = _etag_cache.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    session = await _get_session()
+    async with _sem:
+        async with session.get(url, params=params, headers=headers) as response:
+            if response.status == 304 and cached:
+                fresh[key] = cached[1]
+                return cached[1]
+            response.raise_for_status()
+            data = _loads(await response.read())
+            etag = response.headers.get("ETag")
+            if etag:
+                _etag_cache[key] = (etag, data)
+            fresh[key] = data
+            return data
+
+async def _post_json(url: str, payload: dict) -> Any:
+    """POST JSON to a GitHub API endpoint and return the parsed JSON body"""
+    session = await _get_session()
+    async with session.post(url, json=payload) as response:
+        response.raise_for_status()
+        data = _loads(await response.read())
+    # A write makes every cached read under this repo stale
+    if "/repos/" in url:
+        _invalidate("/".join(url.split("/")[:6]))
+    return data
+
+_LINK_LAST = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+def _page_items(page: Any) -> list:
+    # List endpoints return an array; the search API wraps it in "items"
+    return page if isinstance(page, list) else page.get("items", [])
+
+async def _get_paginated(url: str, params: Optional[dict] = None, max_results: int = 30) -> list:
+    """Fetch up to max_results list items, overlapping pages after the first.
+
+    The first request asks for 100 items and reads the Link header's
+    rel="last" page number; any remaining pages are fetched together
+    (each _get_json call queues on _sem, so fan-out stays bounded),
+    putting a deep listing at roughly one round-trip instead of one per
+    page. When the rate-limit budget is nearly spent the fan-out is
+    skipped and only the first page is returned.
+    """
+    params = {**(params or {}), "per_page": "100"}
+    session = await _get_session()
+    async with _sem:
+        async with session.get(url, params=params) as response:
+            response.raise_for_status()
+            items = _page_items(_loads(await response.read()))
+            link = response.headers.get("Link", "")
+            remaining = int(response.headers.get("X-RateLimit-Remaining", "1000"))
+    match = _LINK_LAST.search(link)
+    if not match or len(items) >= max_results:
+        return items[:max_results]
+    last = min(int(match.group(1)), -(-max_results // 100))
+    if remaining < 100:
+        return items[:max_results]
+    pages = await asyncio.gather(
+        *(_get_json(url, params={**params, "page": str(p)}) for p in range(2, last + 1))
+    )
+    for page in pages:
+        items.extend(_page_items(page))
+    return items[:max_results]
+
+# One GraphQL query returns what get_repo_info + list_branches +
+# list_pull_requests surface, for one rate-limit point and one round-trip
+_GQL_SNAPSHOT = """\
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    name nameWithOwner description url stargazerCount forkCount
+    issues(states: OPEN) { totalCount }
+    defaultBranchRef { name }
+    createdAt updatedAt
+    refs(refPrefix: "refs/heads/", first: 100) { nodes { name } }
+    pullRequests(states: OPEN, first: 30) { nodes { number title state author { login } } }
+  }
+}"""
+
+@functools.lru_cache(maxsize=1024)
 def parse_repo(repo_url_or_name: str) -> tuple[str, str]:
-    """Parse repository into owner and repo name"""
+    """Parse repository into owner and repo name.
+
+    Called at the top of every tool branch, so results are memoized and
+    URLs are split directly instead of building a ParseResult.
+    """
     # Handle both URLs and owner/repo format
-    if repo_url_or_name.startswith("http"):
-        parsed = urlparse(repo_url_or_name)
-        parts = parsed.path.strip("/").split("/")
-        return parts[0], parts[1]
-    else:
-        parts = repo_url_or_name.split("/")
-        return parts[0], parts[1]
+    if "://" in repo_url_or_name:
+        parts = repo_url_or_name.split("://", 1)[1].strip("/").split("/")
+        return parts[1], parts[2]
+    parts = repo_url_or_name.split("/")
+    return parts[0], parts[1]
+
+# Tool schemas are static; build them once at import instead of per tools/list request
+_TOOLS = [
+    Tool(
+        name="get_repo_info",
+        description="Get information about a GitHub repository",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo": {"type": "string", "description": "Repository (owner/repo or URL)"}
+            },
+            "required": ["repo"]
+        }
+    ),
+    Tool(
+        name="list_branches",
+        description="List all branches in a repository",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo": {"type": "string", "description": "Repository (owner/repo or URL)"}
+            },
+            "required": ["repo"]
+        }
+    ),
+    Tool(
+        name="list_pull_requests",
+        description="List pull requests in a repository",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
+                "state": {"type": "string", "description": "State: open, closed, or all", "default": "open"},
+                "max_results": {"type": "integer", "description": "Maximum number of PRs to return", "default": 30}
+            },
+            "required": ["repo"]
+        }
+    ),
+    Tool(
+        name="create_pull_request",
+        description="Create a new pull request",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
+                "title": {"type": "string", "description": "PR title"},
+                "body": {"type": "string", "description": "PR description"},
+                "head": {"type": "string", "description": "Branch with changes"},
+                "base": {"type": "string", "description": "Target branch (default: main)"}
+            },
+            "required": ["repo", "title", "head"]
+        }
+    ),
+    Tool(
+        name="get_pull_request",
+        description="Get details of a specific pull request",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
+                "pr_number": {"type": "integer", "description": "Pull request number"}
+            },
+            "required": ["repo", "pr_number"]
+        }
+    ),
+    Tool(
+        name="list_issues",
+        description="List issues in a repository",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
+                "state": {"type": "string", "description": "State: open, closed, or all", "default": "open"},
+                "max_results": {"type": "integer", "description": "Maximum number of issues to return", "default": 30}
+            },
+            "required": ["repo"]
+        }
+    ),
+    Tool(
+        name="create_issue",
+        description="Create a new issue",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
+                "title": {"type": "string", "description": "Issue title"},
+                "body": {"type": "string", "description": "Issue description"},
+                "labels": {"type": "array", "items": {"type": "string"}, "description": "Issue labels"}
+            },
+            "required": ["repo", "title"]
+        }
+    ),
+    Tool(
+        name="get_file_content",
+        description="Get the content of a file from a repository",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
+                "path": {"type": "string", "description": "File path in repo"},
+                "ref": {"type": "string", "description": "Branch, tag, or commit (default: default branch)"}
+            },
+            "required": ["repo", "path"]
+        }
+    ),
+    Tool(
+        name="list_commits",
+        description="List commits in a repository",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
+                "sha": {"type": "string", "description": "Branch or commit to start from"},
+                "max_results": {"type": "integer", "description": "Maximum number of commits to return", "default": 30}
+            },
+            "required": ["repo"]
+        }
+    ),
+    Tool(
+        name="get_repo_overview",
+        description="Get repository info, branches, and open pull requests in one call",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo": {"type": "string", "description": "Repository (owner/repo or URL)"}
+            },
+            "required": ["repo"]
+        }
+    ),
+    Tool(
+        name="get_repo_snapshot",
+        description="Get repository info, branches, and open pull requests via a single GraphQL query",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo": {"type": "string", "description": "Repository (owner/repo or URL)"}
+            },
+            "required": ["repo"]
+        }
+    ),
+    Tool(
+        name="search_repositories",
+        description="Search for GitHub repositories",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Search query"},
+                "sort": {"type": "string", "description": "Sort by: stars, forks, updated"},
+                "max_results": {"type": "integer", "description": "Maximum number of repositories to return", "default": 30}
+            },
+            "required": ["query"]
+        }
+    )
+]
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
-    return [
-        Tool(
-            name="get_repo_info",
-            description="Get information about a GitHub repository",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo": {"type": "string", "description": "Repository (owner/repo or URL)"}
-                },
-                "required": ["repo"]
-            }
-        ),
-        Tool(
-            name="list_branches",
-            description="List all branches in a repository",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo": {"type": "string", "description": "Repository (owner/repo or URL)"}
-                },
-                "required": ["repo"]
-            }
-        ),
-        Tool(
-            name="list_pull_requests",
-            description="List pull requests in a repository",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
-                    "state": {"type": "string", "description": "State: open, closed, or all", "default": "open"}
-                },
-                "required": ["repo"]
-            }
-        ),
-        Tool(
-            name="create_pull_request",
-            description="Create a new pull request",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
-                    "title": {"type": "string", "description": "PR title"},
-                    "body": {"type": "string", "description": "PR description"},
-                    "head": {"type": "string", "description": "Branch with changes"},
-                    "base": {"type": "string", "description": "Target branch (default: main)"}
-                },
-                "required": ["repo", "title", "head"]
-            }
-        ),
-        Tool(
-            name="get_pull_request",
-            description="Get details of a specific pull request",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
-                    "pr_number": {"type": "integer", "description": "Pull request number"}
-                },
-                "required": ["repo", "pr_number"]
-            }
-        ),
-        Tool(
-            name="list_issues",
-            description="List issues in a repository",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
-                    "state": {"type": "string", "description": "State: open, closed, or all", "default": "open"}
-                },
-                "required": ["repo"]
-            }
-        ),
-        Tool(
-            name="create_issue",
-            description="Create a new issue",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
-                    "title": {"type": "string", "description": "Issue title"},
-                    "body": {"type": "string", "description": "Issue description"},
-                    "labels": {"type": "array", "items": {"type": "string"}, "description": "Issue labels"}
-                },
-                "required": ["repo", "title"]
-            }
-        ),
-        Tool(
-            name="get_file_content",
-            description="Get the content of a file from a repository",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
-                    "path": {"type": "string", "description": "File path in repo"},
-                    "ref": {"type": "string", "description": "Branch, tag, or commit (default: default branch)"}
-                },
-                "required": ["repo", "path"]
-            }
-        ),
-        Tool(
-            name="list_commits",
-            description="List commits in a repository",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo": {"type": "string", "description": "Repository (owner/repo or URL)"},
-                    "sha": {"type": "string", "description": "Branch or commit to start from"},
-                    "per_page": {"type": "integer", "description": "Results per page (max 100)", "default": 30}
-                },
-                "required": ["repo"]
-            }
-        ),
-        Tool(
-            name="search_repositories",
-            description="Search for GitHub repositories",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {"type": "string", "description": "Search query"},
-                    "sort": {"type": "string", "description": "Sort by: stars, forks, updated"},
-                    "per_page": {"type": "integer", "description": "Results per page (max 100)", "default": 30}
-                },
-                "required": ["query"]
-            }
-        )
-    ]
+    return _TOOLS
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     try:
         if name == "get_repo_info":
             owner, repo = parse_repo(arguments["repo"])
-            response = requests.get(
-                f"https://api.github.com/repos/{owner}/{repo}",
-                headers=get_headers()
-            )
-            response.raise_for_status()
-            data = response.json()
-            
+            # Repo metadata barely changes; cache it longer than lists
+            data = await _get_json(f"https://api.github.com/repos/{owner}/{repo}", ttl=300)
+
             info = {
                 "name": data["name"],
                 "full_name": data["full_name"],
@@ -202,35 +381,30 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 "created_at": data["created_at"],
                 "updated_at": data["updated_at"]
             }
-            return [TextContent(type="text", text=json.dumps(info, indent=2))]
-        
+            return [TextContent(type="text", text=dumps_indented(info))]
+
         elif name == "list_branches":
             owner, repo = parse_repo(arguments["repo"])
-            response = requests.get(
-                f"https://api.github.com/repos/{owner}/{repo}/branches",
-                headers=get_headers()
-            )
-            response.raise_for_status()
-            branches = [b["name"] for b in response.json()]
+            data = await _get_json(f"https://api.github.com/repos/{owner}/{repo}/branches")
+            branches = [b["name"] for b in data]
             return [TextContent(type="text", text="\n".join(branches))]
-        
+
         elif name == "list_pull_requests":
             owner, repo = parse_repo(arguments["repo"])
             state = arguments.get("state", "open")
-            response = requests.get(
+            data = await _get_paginated(
                 f"https://api.github.com/repos/{owner}/{repo}/pulls",
                 params={"state": state},
-                headers=get_headers()
+                max_results=arguments.get("max_results", 30)
             )
-            response.raise_for_status()
-            
+
             prs = []
-            for pr in response.json():
+            for pr in data:
                 prs.append(f"#{pr['number']} - {pr['title']} ({pr['state']}) by {pr['user']['login']}")
-            
+
             result = "\n".join(prs) if prs else f"No {state} pull requests found"
             return [TextContent(type="text", text=result)]
-        
+
         elif name == "create_pull_request":
             owner, repo = parse_repo(arguments["repo"])
             data = {
@@ -239,29 +413,21 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 "head": arguments["head"],
                 "base": arguments.get("base", "main")
             }
-            
-            response = requests.post(
+
+            pr = await _post_json(
                 f"https://api.github.com/repos/{owner}/{repo}/pulls",
-                json=data,
-                headers=get_headers()
+                data
             )
-            response.raise_for_status()
-            pr = response.json()
-            
+
             result = f"Created PR #{pr['number']}: {pr['title']}\nURL: {pr['html_url']}"
             return [TextContent(type="text", text=result)]
-        
+
         elif name == "get_pull_request":
             owner, repo = parse_repo(arguments["repo"])
             pr_number = arguments["pr_number"]
-            
-            response = requests.get(
-                f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}",
-                headers=get_headers()
-            )
-            response.raise_for_status()
-            pr = response.json()
-            
+
+            pr = await _get_json(f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}")
+
             info = {
                 "number": pr["number"],
                 "title": pr["title"],
@@ -276,27 +442,26 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 "mergeable": pr.get("mergeable"),
                 "merged": pr.get("merged", False)
             }
-            return [TextContent(type="text", text=json.dumps(info, indent=2))]
-        
+            return [TextContent(type="text", text=dumps_indented(info))]
+
         elif name == "list_issues":
             owner, repo = parse_repo(arguments["repo"])
             state = arguments.get("state", "open")
-            
-            response = requests.get(
+
+            data = await _get_paginated(
                 f"https://api.github.com/repos/{owner}/{repo}/issues",
                 params={"state": state},
-                headers=get_headers()
+                max_results=arguments.get("max_results", 30)
             )
-            response.raise_for_status()
-            
+
             issues = []
-            for issue in response.json():
+            for issue in data:
                 if "pull_request" not in issue:  # Skip PRs
                     issues.append(f"#{issue['number']} - {issue['title']} ({issue['state']}) by {issue['user']['login']}")
-            
+
             result = "\n".join(issues) if issues else f"No {state} issues found"
             return [TextContent(type="text", text=result)]
-        
+
         elif name == "create_issue":
             owner, repo = parse_repo(arguments["repo"])
             data = {
@@ -305,110 +470,158 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             }
             if "labels" in arguments:
                 data["labels"] = arguments["labels"]
-            
-            response = requests.post(
+
+            issue = await _post_json(
                 f"https://api.github.com/repos/{owner}/{repo}/issues",
-                json=data,
-                headers=get_headers()
+                data
             )
-            response.raise_for_status()
-            issue = response.json()
-            
+
             result = f"Created issue #{issue['number']}: {issue['title']}\nURL: {issue['html_url']}"
             return [TextContent(type="text", text=result)]
-        
+
         elif name == "get_file_content":
             owner, repo = parse_repo(arguments["repo"])
             path = arguments["path"]
             ref = arguments.get("ref")
-            
+
             params = {}
             if ref:
                 params["ref"] = ref
-            
-            response = requests.get(
+
+            data = await _get_json(
                 f"https://api.github.com/repos/{owner}/{repo}/contents/{path}",
                 params=params,
-                headers=get_headers()
+                ttl=60
             )
-            response.raise_for_status()
-            data = response.json()
-            
+
             # Decode base64 content
             import base64
             content = base64.b64decode(data["content"]).decode("utf-8")
             return [TextContent(type="text", text=content)]
-        
+
         elif name == "list_commits":
             owner, repo = parse_repo(arguments["repo"])
-            params = {"per_page": arguments.get("per_page", 30)}
+            params = {}
             if "sha" in arguments:
                 params["sha"] = arguments["sha"]
-            
-            response = requests.get(
+
+            data = await _get_paginated(
                 f"https://api.github.com/repos/{owner}/{repo}/commits",
                 params=params,
-                headers=get_headers()
+                max_results=arguments.get("max_results", arguments.get("per_page", 30))
             )
-            response.raise_for_status()
-            
+
             commits = []
-            for commit in response.json():
+            for commit in data:
                 commits.append(
                     f"{commit['sha'][:7]} - {commit['commit']['message'].split(chr(10))[0]} "
                     f"by {commit['commit']['author']['name']}"
                 )
-            
+
             return [TextContent(type="text", text="\n".join(commits))]
-        
-        elif name == "search_repositories":
-            params = {
-                "q": arguments["query"],
-                "per_page": arguments.get("per_page", 30)
+
+        elif name == "get_repo_overview":
+            owner, repo = parse_repo(arguments["repo"])
+            base = f"https://api.github.com/repos/{owner}/{repo}"
+
+            # Three independent fetches overlap; wall time is the slowest
+            # round-trip rather than the sum
+            data, branches, pulls = await asyncio.gather(
+                _get_json(base),
+                _get_json(f"{base}/branches"),
+                _get_json(f"{base}/pulls", params={"state": "open"})
+            )
+
+            overview = {
+                "name": data["name"],
+                "full_name": data["full_name"],
+                "description": data.get("description"),
+                "url": data["html_url"],
+                "stars": data["stargazers_count"],
+                "forks": data["forks_count"],
+                "open_issues": data["open_issues_count"],
+                "default_branch": data["default_branch"],
+                "branches": [b["name"] for b in branches],
+                "open_pull_requests": [
+                    f"#{pr['number']} - {pr['title']} by {pr['user']['login']}" for pr in pulls
+                ]
             }
+            return [TextContent(type="text", text=dumps_indented(overview))]
+
+        elif name == "get_repo_snapshot":
+            owner, repo = parse_repo(arguments["repo"])
+            result = await _post_json(
+                "https://api.github.com/graphql",
+                {"query": _GQL_SNAPSHOT, "variables": {"owner": owner, "name": repo}}
+            )
+
+            if result.get("errors"):
+                return [TextContent(type="text", text=f"GitHub API error: {result['errors'][0]['message']}")]
+
+            node = result["data"]["repository"]
+            snapshot = {
+                "name": node["name"],
+                "full_name": node["nameWithOwner"],
+                "description": node["description"],
+                "url": node["url"],
+                "stars": node["stargazerCount"],
+                "forks": node["forkCount"],
+                "open_issues": node["issues"]["totalCount"],
+                "default_branch": node["defaultBranchRef"]["name"] if node["defaultBranchRef"] else None,
+                "created_at": node["createdAt"],
+                "updated_at": node["updatedAt"],
+                "branches": [n["name"] for n in node["refs"]["nodes"]],
+                "open_pull_requests": [
+                    f"#{pr['number']} - {pr['title']} by {pr['author']['login'] if pr['author'] else 'unknown'}"
+                    for pr in node["pullRequests"]["nodes"]
+                ]
+            }
+            return [TextContent(type="text", text=dumps_indented(snapshot))]
+
+        elif name == "search_repositories":
+            params = {"q": arguments["query"]}
             if "sort" in arguments:
                 params["sort"] = arguments["sort"]
-            
-            response = requests.get(
+
+            data = await _get_paginated(
                 "https://api.github.com/search/repositories",
                 params=params,
-                headers=get_headers()
+                max_results=arguments.get("max_results", arguments.get("per_page", 30))
             )
-            response.raise_for_status()
-            
+
             repos = []
-            for repo in response.json()["items"]:
+            for repo in data:
                 repos.append(
                     f"{repo['full_name']} - {repo.get('description', 'No description')} "
                     f"(⭐ {repo['stargazers_count']})"
                 )
-            
+
             return [TextContent(type="text", text="\n".join(repos))]
-        
+
         else:
             return [TextContent(type="text", text=f"Unknown tool: {name}")]
-    
-    except requests.exceptions.HTTPError as e:
-        error_msg = f"GitHub API error: {e.response.status_code}"
-        try:
-            error_data = e.response.json()
-            error_msg += f" - {error_data.get('message', '')}"
-        except:
-            pass
+
+    except aiohttp.ClientResponseError as e:
+        error_msg = f"GitHub API error: {e.status}"
+        if e.message:
+            error_msg += f" - {e.message}"
         return [TextContent(type="text", text=error_msg)]
-    
+
     except Exception as e:
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 async def main():
     from mcp.server.stdio import stdio_server
-    
+
     async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+        try:
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+        finally:
+            await _close_session()
 
 if __name__ == "__main__":
     asyncio.run(main())
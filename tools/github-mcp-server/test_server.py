@@ -74,7 +74,7 @@ class TestGitHubAPIIntegration(unittest.TestCase):
         if not self.has_real_token:
             self.skipTest("Skipping integration test - no valid GITHUB_TOKEN in environment")
     
-    @patch('server.requests.get')
+    @patch('requests.get')
     def test_get_repo_info_mock(self, mock_get):
         """Test get_repo_info with mocked API response"""
         # Mock the response
@@ -103,7 +103,7 @@ class TestGitHubAPIIntegration(unittest.TestCase):
         self.assertEqual(data["name"], "allotmint")
         self.assertEqual(data["full_name"], "leonarduk/allotmint")
     
-    @patch('server.requests.get')
+    @patch('requests.get')
     def test_list_branches_mock(self, mock_get):
         """Test list_branches with mocked API response"""
         mock_response = Mock()
@@ -122,7 +122,7 @@ class TestGitHubAPIIntegration(unittest.TestCase):
         self.assertIn("main", branches)
         self.assertEqual(len(branches), 3)
     
-    @patch('server.requests.get')
+    @patch('requests.get')
     def test_list_pull_requests_mock(self, mock_get):
         """Test list_pull_requests with mocked API response"""
         mock_response = Mock()
@@ -151,7 +151,7 @@ class TestGitHubAPIIntegration(unittest.TestCase):
         self.assertEqual(prs[0]["number"], 1)
         self.assertEqual(prs[0]["state"], "open")
     
-    @patch('server.requests.post')
+    @patch('requests.post')
     def test_create_pull_request_mock(self, mock_post):
         """Test create_pull_request with mocked API response"""
         mock_response = Mock()
@@ -178,7 +178,7 @@ class TestGitHubAPIIntegration(unittest.TestCase):
         self.assertEqual(pr["number"], 123)
         self.assertEqual(pr["title"], "New Feature")
     
-    @patch('server.requests.get')
+    @patch('requests.get')
     def test_error_handling_404(self, mock_get):
         """Test error handling for 404 response"""
         mock_response = Mock()
@@ -192,7 +192,7 @@ class TestGitHubAPIIntegration(unittest.TestCase):
         with self.assertRaises(Exception):
             response.raise_for_status()
     
-    @patch('server.requests.get')
+    @patch('requests.get')
     def test_error_handling_401(self, mock_get):
         """Test error handling for unauthorized access"""
         mock_response = Mock()
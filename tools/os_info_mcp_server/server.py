@@ -5,7 +5,7 @@ This tool integrates with MCP protocol to provide system monitoring capabilities
 """
 
 import asyncio
-import json
+import orjson
 import psutil
 from pathlib import Path
 from typing import Optional
@@ -15,6 +15,10 @@ from mcp.types import Tool, TextContent
 # Create the MCP server
 app = Server("cpu-memory-monitor")
 
+def dumps_indented(data) -> str:
+    """Serialize a tool result with 2-space indent via orjson"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
 def format_bytes(bytes_value):
     """Convert bytes to human readable format"""
     for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -67,7 +71,7 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 "cpu_percentage": cpu_percent,
                 "timestamp": asyncio.get_event_loop().time()
             }
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=dumps_indented(result))]
         
         elif name == "get_memory_usage":
             memory = psutil.virtual_memory()
@@ -81,7 +85,7 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 "inactive": memory.inactive,
                 "timestamp": asyncio.get_event_loop().time()
             }
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=dumps_indented(result))]
         
         elif name == "get_system_info":
             # Get CPU info
@@ -110,7 +114,7 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 },
                 "timestamp": asyncio.get_event_loop().time()
             }
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=dumps_indented(result))]
         
         else:
             return [TextContent(type="text", text=f"Unknown tool: {name}")]
@@ -5,7 +5,7 @@ Provides tools for searching the web via Brave Search API and fetching web page
 """
 
 import asyncio
-import json
+import orjson
 import os
 from pathlib import Path
 from typing import Optional
@@ -17,8 +17,18 @@ from mcp.types import Tool, TextContent
 
 app = Server("web-server")
 
+def dumps_indented(data) -> str:
+    """Serialize a tool result with 2-space indent via orjson"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+_ENV_LOADED = False
+
 def load_env():
-    """Load environment variables from .env file"""
+    """Load environment variables from .env file (once per process)"""
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    _ENV_LOADED = True
     env_path = Path(__file__).parent.parent.parent / ".env"
     if env_path.exists():
         with open(env_path) as f:
@@ -135,7 +145,7 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 "results": results
             }
             
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=dumps_indented(result))]
         
         elif name == "web_fetch":
             url = arguments["url"]
@@ -183,7 +193,7 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             if include_html:
                 result["html"] = response.text
             
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=dumps_indented(result))]
         
         else:
             return [TextContent(type="text", text=f"Unknown tool: {name}")]